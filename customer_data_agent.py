@@ -12,19 +12,42 @@ Agent Card at: http://localhost:8001/.well-known/agent.json
 """
 
 import os
-import json
+import re
+import time
 import asyncio
 import httpx
+import anyio
+import orjson
+from contextlib import AsyncExitStack
 from typing import Optional
+from pydantic import BaseModel
 from google.adk.agents import Agent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
+from google.genai import types
 from mcp import ClientSession
 from mcp.client.sse import sse_client
 
+try:
+    import uvloop
+except ImportError:  # optional speedup; uvloop is not available on Windows
+    uvloop = None
+
 # MCP Server URL
 MCP_SERVER_URL = "http://localhost:8000/sse"
 
+# Reconnect policy when the SSE session drops: 0.5s, 1s, 2s between attempts
+MCP_RECONNECT_ATTEMPTS = 3
+MCP_RECONNECT_BASE_DELAY = 0.5
+
+# The MCP toolset is defined in code, so its listing only changes on redeploy
+MCP_TOOLS_CACHE_TTL = 300.0
+
+# Errors that mean the MCP session is gone and must be re-established
+_SESSION_LOST_ERRORS = (ConnectionError, anyio.ClosedResourceError, anyio.BrokenResourceError)
+
 
 class MCPClientWrapper:
     """Wrapper for MCP client to call tools on the MCP server."""
@@ -32,42 +55,126 @@ class MCPClientWrapper:
     def __init__(self, server_url: str):
         self.server_url = server_url
         self._session = None
-        self._streams = None
+        self._exit_stack = None
+        self._reconnect_lock = asyncio.Lock()
+        self._tools_cache = None  # (fetched_at, tools) from the current session
     
     async def connect(self):
         """Connect to MCP server."""
-        self._streams = sse_client(self.server_url)
-        read_stream, write_stream = await self._streams.__aenter__()
-        self._session = ClientSession(read_stream, write_stream)
-        await self._session.__aenter__()
-        await self._session.initialize()
+        stack = AsyncExitStack()
+        try:
+            read_stream, write_stream = await stack.enter_async_context(sse_client(self.server_url))
+            session = await stack.enter_async_context(ClientSession(read_stream, write_stream))
+            await session.initialize()
+        except BaseException:
+            await stack.aclose()
+            raise
+        self._exit_stack = stack
+        self._session = session
         print(f"Connected to MCP server at {self.server_url}")
     
     async def disconnect(self):
         """Disconnect from MCP server."""
-        if self._session:
-            await self._session.__aexit__(None, None, None)
-        if self._streams:
-            await self._streams.__aexit__(None, None, None)
+        stack, self._exit_stack, self._session = self._exit_stack, None, None
+        self._tools_cache = None
+        if stack:
+            await stack.aclose()
+    
+    async def _ensure_session(self) -> ClientSession:
+        """Return the live session, connecting once if there is none yet."""
+        if self._session is None:
+            async with self._reconnect_lock:
+                if self._session is None:
+                    await self.connect()
+        return self._session
+    
+    async def _reconnect(self, stale: ClientSession):
+        """Replace a dropped session, backing off exponentially between attempts."""
+        async with self._reconnect_lock:
+            # Another caller may already have replaced the session
+            if self._session is not stale:
+                return
+            try:
+                await self.disconnect()
+            except Exception:
+                pass  # the old transport is already broken
+            for attempt in range(MCP_RECONNECT_ATTEMPTS):
+                try:
+                    await self.connect()
+                    return
+                except Exception:
+                    # sse_client connects inside an anyio task group, so a
+                    # failed attempt may surface as an ExceptionGroup rather
+                    # than the underlying OSError/httpx error
+                    if attempt == MCP_RECONNECT_ATTEMPTS - 1:
+                        raise
+                    await asyncio.sleep(MCP_RECONNECT_BASE_DELAY * 2 ** attempt)
     
     async def list_tools(self):
-        """List available tools from MCP server."""
-        if not self._session:
-            await self.connect()
-        result = await self._session.list_tools()
+        """List available tools from MCP server, cached per session."""
+        if self._tools_cache is not None:
+            fetched_at, tools = self._tools_cache
+            if time.monotonic() - fetched_at < MCP_TOOLS_CACHE_TTL:
+                return tools
+        session = await self._ensure_session()
+        result = await session.list_tools()
+        self._tools_cache = (time.monotonic(), result.tools)
         return result.tools
     
-    async def call_tool(self, tool_name: str, arguments: dict):
-        """Call a tool on the MCP server."""
-        if not self._session:
-            await self.connect()
-        result = await self._session.call_tool(tool_name, arguments)
-        # Parse the result content
+    async def _call_tool_text(self, tool_name: str, arguments: dict) -> Optional[str]:
+        """Call a tool and return the text of its first text content, if any."""
+        session = await self._ensure_session()
+        try:
+            result = await session.call_tool(tool_name, arguments)
+        except _SESSION_LOST_ERRORS:
+            await self._reconnect(session)
+            result = await self._session.call_tool(tool_name, arguments)
         if result.content:
             for content in result.content:
                 if hasattr(content, 'text'):
-                    return json.loads(content.text)
-        return {"error": "No result returned"}
+                    return content.text
+        return None
+    
+    async def call_tool(self, tool_name: str, arguments: dict):
+        """Call a tool on the MCP server."""
+        text = await self._call_tool_text(tool_name, arguments)
+        if text is None:
+            return {"error": "No result returned"}
+        return orjson.loads(text)
+    
+    async def call_tool_raw(self, tool_name: str, arguments: dict) -> str:
+        """Call a tool and return its JSON text as-is, without parsing it.
+        
+        For read-only pass-through tools whose result goes straight back to
+        the model, this skips a decode/re-encode of the whole payload.
+        """
+        text = await self._call_tool_text(tool_name, arguments)
+        if text is None:
+            return '{"error": "No result returned"}'
+        return text
+    
+    async def call_tools_batch(self, calls: list) -> list:
+        """Call several independent tools concurrently over the one session.
+        
+        Args:
+            calls: List of (tool_name, arguments) pairs
+            
+        Returns:
+            Parsed results in the same order as calls; a call that raised
+            becomes {"success": False, "error": ...} in its slot, so the
+            results of the others (including committed writes) are kept
+        """
+        # Connect up front so concurrent calls share one session
+        await self._ensure_session()
+        results = await asyncio.gather(
+            *(self.call_tool(name, args) for name, args in calls), return_exceptions=True
+        )
+        for i, result in enumerate(results):
+            if isinstance(result, Exception):
+                results[i] = {"success": False, "error": str(result)}
+            elif isinstance(result, BaseException):
+                raise result
+        return results
 
 
 # Global MCP client instance
@@ -75,8 +182,15 @@ mcp_client = MCPClientWrapper(MCP_SERVER_URL)
 
 
 # ==================== Tool Functions for ADK Agent ====================
+# The wrappers keep explicit typed signatures and docstrings because ADK
+# builds each tool's function declaration for the model from them.
 
-async def get_customer(customer_id: int) -> dict:
+def _tool_args(**kwargs) -> dict:
+    """Build MCP arguments, leaving out optional fields the model left empty."""
+    return {k: v for k, v in kwargs.items() if v is not None and v != ""}
+
+
+async def get_customer(customer_id: int) -> str:
     """
     Get customer information by ID from the database via MCP.
     
@@ -84,9 +198,9 @@ async def get_customer(customer_id: int) -> dict:
         customer_id: The unique identifier of the customer
         
     Returns:
-        Customer data including id, name, email, phone, status
+        JSON with customer data including id, name, email, phone, status
     """
-    return await mcp_client.call_tool("get_customer", {"customer_id": customer_id})
+    return await mcp_client.call_tool_raw("get_customer", {"customer_id": customer_id})
 
 
 async def list_customers(status: str = None, limit: int = 10) -> dict:
@@ -100,10 +214,7 @@ async def list_customers(status: str = None, limit: int = 10) -> dict:
     Returns:
         List of customers
     """
-    args = {"limit": limit}
-    if status:
-        args["status"] = status
-    return await mcp_client.call_tool("list_customers", args)
+    return await mcp_client.call_tool("list_customers", _tool_args(status=status, limit=limit))
 
 
 async def update_customer(customer_id: int, email: str = None, 
@@ -120,17 +231,12 @@ async def update_customer(customer_id: int, email: str = None,
     Returns:
         Updated customer data
     """
-    args = {"customer_id": customer_id}
-    if email:
-        args["email"] = email
-    if phone:
-        args["phone"] = phone
-    if name:
-        args["name"] = name
-    return await mcp_client.call_tool("update_customer", args)
+    return await mcp_client.call_tool("update_customer", _tool_args(
+        customer_id=customer_id, email=email, phone=phone, name=name
+    ))
 
 
-async def get_customer_history(customer_id: int) -> dict:
+async def get_customer_history(customer_id: int) -> str:
     """
     Get ticket history for a customer.
     
@@ -138,9 +244,9 @@ async def get_customer_history(customer_id: int) -> dict:
         customer_id: The customer ID
         
     Returns:
-        Customer info and ticket history with statistics
+        JSON with customer info and ticket history with statistics
     """
-    return await mcp_client.call_tool("get_customer_history", {"customer_id": customer_id})
+    return await mcp_client.call_tool_raw("get_customer_history", {"customer_id": customer_id})
 
 
 async def create_ticket(customer_id: int, issue: str, priority: str = "medium") -> dict:
@@ -162,14 +268,108 @@ async def create_ticket(customer_id: int, issue: str, priority: str = "medium")
     })
 
 
-async def get_active_customers_with_open_tickets() -> dict:
+async def get_active_customers_with_open_tickets() -> str:
     """
     Get all active customers who have open tickets.
     
     Returns:
-        List of active customers with their open tickets
+        JSON list of active customers with their open tickets
     """
-    return await mcp_client.call_tool("get_active_customers_with_open_tickets", {})
+    return await mcp_client.call_tool_raw("get_active_customers_with_open_tickets", {})
+
+
+# Tools that batch_customer_ops may fan out to, with the CustomerOp fields
+# each one takes as MCP arguments
+_BATCHABLE_TOOLS = {
+    "get_customer": ("customer_id",),
+    "list_customers": ("status", "limit"),
+    "update_customer": ("customer_id", "email", "phone", "name"),
+    "get_customer_history": ("customer_id",),
+    "create_ticket": ("customer_id", "issue", "priority"),
+    "get_active_customers_with_open_tickets": (),
+}
+
+
+class CustomerOp(BaseModel):
+    """
+    One operation for batch_customer_ops.
+    
+    Fields are typed rather than a free-form arguments dict so the function
+    declaration ADK sends to Gemini has a concrete schema; set only the
+    fields the chosen tool takes.
+    """
+    tool: str
+    customer_id: Optional[int] = None
+    status: Optional[str] = None
+    limit: Optional[int] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    name: Optional[str] = None
+    issue: Optional[str] = None
+    priority: Optional[str] = None
+
+
+async def batch_customer_ops(ops: list[CustomerOp]) -> dict:
+    """
+    Run several independent customer data operations in one step.
+    
+    Use this when a request needs more than one operation whose inputs do not
+    depend on each other (e.g. update an email AND fetch ticket history).
+    
+    Args:
+        ops: List of operations. Each names a tool and sets that tool's
+             arguments as fields, e.g. {"tool": "get_customer_history",
+             "customer_id": 2}. Valid tools: get_customer, list_customers,
+             update_customer, get_customer_history, create_ticket,
+             get_active_customers_with_open_tickets
+        
+    Returns:
+        Results in the same order as ops
+    """
+    calls = []
+    for op in ops:
+        if not isinstance(op, CustomerOp):
+            op = CustomerOp.model_validate(op)
+        fields = _BATCHABLE_TOOLS.get(op.tool)
+        if fields is None:
+            return {"success": False, "error": f"Unknown tool: {op.tool}"}
+        calls.append((op.tool, _tool_args(**{field: getattr(op, field) for field in fields})))
+    return {"success": True, "results": await mcp_client.call_tools_batch(calls)}
+
+
+# ==================== Fast Path (no LLM) ====================
+
+# Requests whose tool and arguments are fully determined by their wording.
+# These are answered straight from MCP instead of asking Gemini to pick the
+# tool. Patterns match the whole (lowercased, trimmed) request.
+_FAST_PATHS = (
+    (re.compile(r"(?:get|show)(?: me)? customer(?: info| information| details)? for (?:customer )?id (\d+)"),
+     "get_customer", lambda m: {"customer_id": int(m[1])}),
+    (re.compile(r"(?:show|list|get)(?: me)? all active customers (?:who have|with) open tickets"),
+     "get_active_customers_with_open_tickets", lambda m: {}),
+)
+
+
+async def fast_path_callback(callback_context: CallbackContext,
+                             llm_request: LlmRequest) -> Optional[LlmResponse]:
+    """Skip the model call for trivially-routed requests.
+    
+    Only the first model call of a turn is eligible (the last content is the
+    user's text, not a tool result); returning None lets ADK call Gemini.
+    """
+    if not llm_request.contents:
+        return None
+    last = llm_request.contents[-1]
+    if last.role != "user" or not last.parts or not last.parts[0].text:
+        return None
+    
+    query = last.parts[0].text.strip().rstrip("?.!").lower()
+    for pattern, tool_name, make_args in _FAST_PATHS:
+        match = pattern.fullmatch(query)
+        if match:
+            text = await mcp_client.call_tool_raw(tool_name, make_args(match))
+            return LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]))
+    return None
 
 
 # ==================== ADK Agent Definition ====================
@@ -194,6 +394,7 @@ Your responsibilities:
 When a request comes in:
 1. Identify what data operation is needed
 2. Use the appropriate tool to access/modify data via MCP
+   (use batch_customer_ops when several independent operations are needed)
 3. Return the results clearly formatted
 
 Always verify customer IDs exist before performing operations.
@@ -205,61 +406,15 @@ Handle errors gracefully and report them clearly.
         update_customer,
         get_customer_history,
         create_ticket,
-        get_active_customers_with_open_tickets
-    ]
+        get_active_customers_with_open_tickets,
+        batch_customer_ops
+    ],
+    before_model_callback=fast_path_callback
 )
 
 
 # ==================== A2A Server Setup ====================
 
-def create_agent_card():
-    """Create the A2A Agent Card for this agent."""
-    return {
-        "name": "customer_data_agent",
-        "description": "Customer Data Agent - Accesses customer database via MCP",
-        "version": "1.0.0",
-        "url": "http://localhost:8001",
-        "capabilities": {
-            "streaming": False,
-            "pushNotifications": False
-        },
-        "skills": [
-            {
-                "id": "get_customer",
-                "name": "Get Customer",
-                "description": "Retrieve customer information by ID"
-            },
-            {
-                "id": "list_customers", 
-                "name": "List Customers",
-                "description": "List customers with optional filters"
-            },
-            {
-                "id": "update_customer",
-                "name": "Update Customer",
-                "description": "Update customer information"
-            },
-            {
-                "id": "get_customer_history",
-                "name": "Get Customer History",
-                "description": "Get ticket history for a customer"
-            },
-            {
-                "id": "create_ticket",
-                "name": "Create Ticket",
-                "description": "Create a new support ticket"
-            },
-            {
-                "id": "get_active_customers_with_open_tickets",
-                "name": "Get Active Customers with Open Tickets",
-                "description": "Get all active customers who have open tickets"
-            }
-        ],
-        "defaultInputModes": ["text"],
-        "defaultOutputModes": ["text"]
-    }
-
-
 async def run_agent_with_a2a():
     """Run the agent with A2A interface using ADK's to_a2a."""
     from google.adk.a2a import to_a2a
@@ -269,7 +424,8 @@ async def run_agent_with_a2a():
     print("Connecting to MCP server...")
     await mcp_client.connect()
     
-    # Create A2A app from the agent
+    # Create A2A app from the agent; to_a2a also serves the agent card,
+    # built from the agent's actual tools
     a2a_app = to_a2a(customer_data_agent, port=8001)
     
     print("="*60)
@@ -291,4 +447,6 @@ if __name__ == "__main__":
         print("Warning: GOOGLE_API_KEY not set. Set it in .env file or environment.")
         print("export GOOGLE_API_KEY=your_api_key_here")
     
+    if uvloop is not None:
+        uvloop.install()
     asyncio.run(run_agent_with_a2a())
@@ -4,7 +4,8 @@ MCP Server for Customer Support System
 A proper MCP server with SSE transport that can be tested with MCP Inspector.
 
 To run:
-    python mcp_server.py
+    python mcp_server.py           (SSE on port 8000)
+    python mcp_server.py --stdio   (stdio transport, for clients that spawn the server)
 
 To test with MCP Inspector:
     npx @modelcontextprotocol/inspector
@@ -20,22 +21,76 @@ Tools implemented:
     - get_active_customers_with_open_tickets()
 """
 
+import argparse
+import asyncio
+import queue
 import sqlite3
-import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager, redirect_stdout
 from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
+
+import orjson
 from mcp.server.fastmcp import FastMCP
 
+try:
+    import uvloop
+except ImportError:  # optional speedup; uvloop is not available on Windows
+    uvloop = None
+
 # =============================================================================
 # Database Setup
 # =============================================================================
 
 DB_PATH = "support.db"
 
+def _apply_pragmas(conn):
+    """Apply per-connection performance pragmas."""
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA foreign_keys=ON")
+
+# Sort key for ticket priority (most urgent first). A VIRTUAL generated column
+# costs no storage, can be added to an existing table with ALTER TABLE, and can
+# be indexed, so queries order by it instead of evaluating a CASE per row.
+_PRIORITY_RANK_COLUMN = (
+    "priority_rank INTEGER GENERATED ALWAYS AS "
+    "(CASE priority WHEN 'high' THEN 1 WHEN 'medium' THEN 2 ELSE 3 END) VIRTUAL"
+)
+
+# Stored in the database header (PRAGMA user_version) once setup completes;
+# bump it whenever setup_database changes the schema or indexes
+SCHEMA_VERSION = 1
+
 def setup_database():
     """Initialize database with tables and sample data."""
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
+    # A database already at the current schema needs none of the DDL below;
+    # reading user_version is a header read, not a schema parse
+    if cursor.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+        print("✅ Database already exists")
+        conn.close()
+        return
+    
+    # WAL lets readers proceed while a writer commits. journal_mode is stored
+    # in the database file; the other pragmas are re-applied on every pooled connection.
+    cursor.execute("PRAGMA journal_mode=WAL")
+    _apply_pragmas(conn)
+    
+    # Schema, indexes and seed data go in one transaction: one commit (and WAL
+    # sync) instead of an autocommit per DDL statement
+    cursor.execute("BEGIN")
+    
     # Create customers table
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS customers (
@@ -50,7 +105,7 @@ def setup_database():
     """)
     
     # Create tickets table
-    cursor.execute("""
+    cursor.execute(f"""
         CREATE TABLE IF NOT EXISTS tickets (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             customer_id INTEGER NOT NULL,
@@ -58,14 +113,37 @@ def setup_database():
             status TEXT NOT NULL DEFAULT 'open',
             priority TEXT NOT NULL DEFAULT 'medium',
             created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            {_PRIORITY_RANK_COLUMN},
             FOREIGN KEY (customer_id) REFERENCES customers(id)
         )
     """)
     
+    # Databases created before priority_rank existed get it added in place
+    columns = {row[1] for row in cursor.execute("PRAGMA table_xinfo(tickets)")}
+    if "priority_rank" not in columns:
+        cursor.execute(f"ALTER TABLE tickets ADD COLUMN {_PRIORITY_RANK_COLUMN}")
+    
+    # Create indexes for history lookups, the open-ticket report (tickets in
+    # priority_rank order per customer), priority filters and customer status
+    # filters. Composite indexes also serve lookups on their leading column
+    # alone, so earlier ticket indexes that are now prefixes (or leading on a
+    # column no query filters by alone) are dropped.
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tickets_customer_status ON tickets(customer_id, status, created_at DESC)"
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tickets_priority_status ON tickets(priority, status)")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tickets_priority_rank ON tickets(customer_id, status, priority_rank)"
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_customers_status ON customers(status)")
+    for stale_index in ("idx_tickets_customer_id", "idx_tickets_status",
+                        "idx_tickets_cust_status", "idx_tickets_status_priority"):
+        cursor.execute(f"DROP INDEX IF EXISTS {stale_index}")
+    
     # Check if data exists
     cursor.execute("SELECT COUNT(*) FROM customers")
     if cursor.fetchone()[0] == 0:
-        # Insert sample customers
+        # Insert sample customers (one multi-row INSERT per table)
         customers = [
             ("John Doe", "john.doe@example.com", "+1-555-0101", "active"),
             ("Jane Smith", "jane.smith@example.com", "+1-555-0102", "active"),
@@ -75,9 +153,10 @@ def setup_database():
             ("Diana Prince", "diana.prince@company.org", "+1-555-0106", "active"),
             ("Edward Norton", "e.norton@business.net", "+1-555-0107", "active"),
         ]
-        cursor.executemany(
-            "INSERT INTO customers (name, email, phone, status) VALUES (?, ?, ?, ?)",
-            customers
+        cursor.execute(
+            "INSERT INTO customers (name, email, phone, status) VALUES "
+            + ", ".join(["(?, ?, ?, ?)"] * len(customers)),
+            [value for row in customers for value in row]
         )
         
         # Insert sample tickets
@@ -90,36 +169,574 @@ def setup_database():
             (6, "Dashboard loading slowly", "open", "medium"),
             (7, "Payment processing failing", "open", "high"),
         ]
-        cursor.executemany(
-            "INSERT INTO tickets (customer_id, issue, status, priority) VALUES (?, ?, ?, ?)",
-            tickets
+        cursor.execute(
+            "INSERT INTO tickets (customer_id, issue, status, priority) VALUES "
+            + ", ".join(["(?, ?, ?, ?)"] * len(tickets)),
+            [value for row in tickets for value in row]
         )
         
-        conn.commit()
+        # Collect statistics so the query planner picks the indexes
+        cursor.execute("ANALYZE")
         print("✅ Database initialized with sample data")
     else:
         print("✅ Database already exists")
     
+    cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.commit()
     conn.close()
 
-def get_db():
-    """Get database connection with Row factory."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+# One read-write connection plus a small pool of read-only connections: in
+# WAL mode readers never block the writer (or each other), so read tools only
+# serialize on the pool size, and writes go through the group-commit thread.
+READER_POOL_SIZE = 8
+
+_writer = None
+_conn_lock = threading.Lock()
+_write_lock = threading.Lock()
+
+class SqlitePool:
+    """A bounded pool of SQLite connections.
+    
+    Connections are created by the given factory, either all at once with
+    open_all() or lazily up to size; once all are open, acquire() waits for
+    one to be returned.
+    """
+    
+    def __init__(self, connect, size: int):
+        self._connect = connect
+        self.size = size
+        self._idle = queue.Queue(maxsize=size)
+        self._opened = 0
+        self._lock = threading.Lock()
+    
+    def _claim(self, count: int) -> int:
+        """Reserve up to count unopened slots and return how many were reserved."""
+        with self._lock:
+            claimed = min(count, self.size - self._opened)
+            self._opened += claimed
+        return claimed
+    
+    def _open_claimed(self):
+        """Open a connection for a reserved slot, giving the slot back if that fails."""
+        try:
+            return self._connect()
+        except BaseException:
+            with self._lock:
+                self._opened -= 1
+            raise
+    
+    def open_all(self):
+        """Open every remaining connection up front."""
+        while self._claim(1):
+            self._idle.put(self._open_claimed())
+    
+    @contextmanager
+    def acquire(self):
+        """Borrow a connection, returning it to the pool afterwards."""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._open_claimed() if self._claim(1) else self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+def _get_writer():
+    """Open the shared read-write connection on first use."""
+    global _writer
+    if _writer is None:
+        with _conn_lock:
+            if _writer is None:
+                conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None,
+                                       cached_statements=256)
+                _apply_pragmas(conn)
+                _writer = conn
+    return _writer
+
+def _open_reader():
+    """Open a read-only connection to the database."""
+    # The writer keeps the -wal/-shm files alive, which a mode=ro connection
+    # cannot create on its own.
+    _get_writer()
+    conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True, check_same_thread=False,
+                           isolation_level=None, cached_statements=256)
+    _apply_pragmas(conn)
     return conn
 
+reader_pool = SqlitePool(_open_reader, READER_POOL_SIZE)
+
+def open_pool():
+    """Open the writer and every reader up front so no tool call pays for a connect."""
+    _get_writer()
+    reader_pool.open_all()
+
+@contextmanager
+def get_db_rw():
+    """Hold the write lock and yield the shared read-write connection."""
+    with _write_lock:
+        yield _get_writer()
+
+# Writes are group-committed: one thread drains whatever writes are queued (up
+# to WRITE_BATCH_SIZE) and runs them in a single transaction, so concurrent
+# writers share one WAL commit instead of paying for one each. Nothing waits
+# for a batch to fill, so a lone write is committed immediately.
+WRITE_BATCH_SIZE = 16
+# Upper bound on how long a tool waits for its write to be committed, so a
+# stuck writer surfaces as an error instead of a hung worker thread
+WRITE_TIMEOUT = 30.0
+
+_write_queue = queue.Queue()
+_write_thread = None
+
+def _run_write_batch(batch):
+    """Run one batch of queued writes in a transaction and return their outcomes."""
+    results = []
+    with get_db_rw() as conn:
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for future, job, args in batch:
+                # A savepoint per write keeps one failing write from
+                # rolling back the others in its batch
+                conn.execute("SAVEPOINT write_item")
+                try:
+                    results.append((future, job(conn.cursor(), *args), None))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO write_item")
+                    results.append((future, None, e))
+                conn.execute("RELEASE write_item")
+            conn.execute("COMMIT")
+        except Exception as e:
+            if conn.in_transaction:
+                try:
+                    conn.execute("ROLLBACK")
+                except Exception:
+                    pass  # the batch already failed; report the original error
+            results = [(future, None, e) for future, _, _ in batch]
+    return results
+
+def _write_loop():
+    """Run queued writes in batches, one transaction per batch."""
+    while True:
+        batch = [_write_queue.get()]
+        while len(batch) < WRITE_BATCH_SIZE:
+            try:
+                batch.append(_write_queue.get_nowait())
+            except queue.Empty:
+                break
+        
+        # Any failure, including opening the connection, is reported to the
+        # batch's writers; the thread itself must keep serving later writes
+        try:
+            results = _run_write_batch(batch)
+        except Exception as e:
+            results = [(future, None, e) for future, _, _ in batch]
+        
+        # Only report back once the batch is durable
+        for future, result, error in results:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+def _submit_write(job, *args):
+    """Queue job(cursor, *args) for the group-commit thread and wait for its result."""
+    global _write_thread
+    if _write_thread is None or not _write_thread.is_alive():
+        with _conn_lock:
+            # Start the thread on first use, or replace one that has died
+            if _write_thread is None or not _write_thread.is_alive():
+                _write_thread = threading.Thread(target=_write_loop, name="sqlite-writer", daemon=True)
+                _write_thread.start()
+    future = Future()
+    _write_queue.put((future, job, args))
+    return future.result(timeout=WRITE_TIMEOUT)
+
 # =============================================================================
 # MCP Server Definition
 # =============================================================================
 
 mcp = FastMCP(name="CustomerSupportMCP")
 
+# =============================================================================
+# Tool Implementations - return plain dicts for in-process callers
+# =============================================================================
+
+# Explicit column lists: rows come back as plain tuples and are zipped
+# against these once, instead of looking names up per row
+CUSTOMER_COLUMNS = ("id", "name", "email", "phone", "status", "created_at", "updated_at")
+TICKET_COLUMNS = ("id", "customer_id", "issue", "status", "priority", "created_at")
+_CUSTOMER_SELECT = "SELECT " + ", ".join(CUSTOMER_COLUMNS) + " FROM customers"
+_PRIORITY_TICKET_COLUMNS = TICKET_COLUMNS + ("customer_name",)
+_PRIORITY_TICKET_SELECT = (
+    "SELECT " + ", ".join("t." + col for col in TICKET_COLUMNS) + ", c.name AS customer_name "
+    "FROM tickets t JOIN customers c ON t.customer_id = c.id WHERE t.priority = ?"
+)
+
+# Allowed values for the enumerated columns; arguments are checked against
+# these before a tool touches the cache, the pool or the write queue
+CUSTOMER_STATUSES = ("active", "disabled")
+TICKET_STATUSES = ("open", "in_progress", "resolved")
+TICKET_PRIORITIES = ("low", "medium", "high")
+
+
+def _invalid(field: str, value: str, allowed: tuple):
+    """Return an error result if value is set and not one of allowed, else None."""
+    if value and value not in allowed:
+        return {"success": False, "error": f"Invalid {field} '{value}'; expected one of {', '.join(allowed)}"}
+    return None
+
+# Every statement a tool runs is a complete module-level string, so the
+# connection's statement cache (cached_statements=256) is hit by the same
+# object on every call instead of a freshly concatenated copy
+_GET_CUSTOMER_SQL = _CUSTOMER_SELECT + " WHERE id = ?"
+_LIST_CUSTOMERS_SQL = _CUSTOMER_SELECT + " LIMIT ?"
+_LIST_CUSTOMERS_BY_STATUS_SQL = _CUSTOMER_SELECT + " WHERE status = ? LIMIT ?"
+_TICKETS_BY_PRIORITY_SQL = _PRIORITY_TICKET_SELECT
+_TICKETS_BY_PRIORITY_STATUS_SQL = _PRIORITY_TICKET_SELECT + " AND t.status = ?"
+
+# Customer, tickets and ticket statistics in one round trip; the LEFT JOIN
+# still yields one row (with NULL ticket columns) for a customer without
+# tickets, and the window aggregates repeat on every row.
+_CUSTOMER_HISTORY_SQL = """
+    SELECT c.id, c.name, c.email, c.phone, c.status, c.created_at, c.updated_at,
+           t.id AS ticket_id, t.issue, t.status AS ticket_status, t.priority,
+           t.created_at AS ticket_created_at,
+           COUNT(t.id) OVER () AS total,
+           COALESCE(SUM(t.status = 'open') OVER (), 0) AS open,
+           COALESCE(SUM(t.status = 'in_progress') OVER (), 0) AS in_progress,
+           COALESCE(SUM(t.status = 'resolved') OVER (), 0) AS resolved
+    FROM customers c
+    LEFT JOIN tickets t ON t.customer_id = c.id
+    WHERE c.id = ?
+    ORDER BY t.created_at DESC, t.id DESC
+"""
+
+# One flat JOIN, ordered so each customer's rows are contiguous (by name) and
+# their tickets come most urgent first; grouped in Python afterwards.
+_OPEN_TICKETS_REPORT_SQL = """
+    SELECT c.id, c.name, c.email, c.status, t.id, t.issue, t.priority
+    FROM customers c
+    JOIN tickets t ON t.customer_id = c.id
+    WHERE c.status = 'active' AND t.status = 'open'
+    ORDER BY c.name, c.id, t.priority_rank, t.id
+"""
+
+# NULL parameters leave the column unchanged, so one statement serves every
+# combination of updated fields; RETURNING hands back the updated row, and an
+# empty result means the customer does not exist
+_UPDATE_CUSTOMER_SQL = (
+    "UPDATE customers SET email = COALESCE(?, email), phone = COALESCE(?, phone), "
+    "name = COALESCE(?, name), status = COALESCE(?, status), updated_at = CURRENT_TIMESTAMP "
+    "WHERE id = ? RETURNING " + ", ".join(CUSTOMER_COLUMNS)
+)
+# Selecting the customer_id from customers makes the insert a no-op for an
+# unknown customer, so validation, insert and fetch are a single statement
+_INSERT_TICKET_SQL = (
+    "INSERT INTO tickets (customer_id, issue, status, priority) "
+    "SELECT id, ?, 'open', ? FROM customers WHERE id = ? "
+    "RETURNING " + ", ".join(TICKET_COLUMNS) + ", "
+    "(SELECT name FROM customers WHERE id = customer_id)"
+)
+
+
+class _TTLCache:
+    """Small thread-safe LRU cache whose entries expire after ttl seconds.
+    
+    Invalidation bumps a version number; set() takes the version read before
+    the query and drops the value if a write invalidated it in the meantime,
+    so a slow read can't re-cache a row that was just updated.
+    """
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key, value, version: int):
+        with self._lock:
+            if version != self.version:
+                return
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def pop(self, key):
+        with self._lock:
+            self.version += 1
+            self._data.pop(key, None)
+    
+    def clear(self):
+        with self._lock:
+            self.version += 1
+            self._data.clear()
+
+
+# Agents tend to fetch the same customer several times per conversation.
+# Listings change whenever any customer does, so they get a shorter TTL.
+_customer_cache = _TTLCache(maxsize=512, ttl=60.0)
+_customer_list_cache = _TTLCache(maxsize=64, ttl=5.0)
+
+
+def _get_customer_impl(customer_id: int) -> dict:
+    """Fetch one customer by ID."""
+    cached = _customer_cache.get(customer_id)
+    if cached is not None:
+        return cached
+    
+    version = _customer_cache.version
+    with reader_pool.acquire() as conn:
+        row = conn.execute(_GET_CUSTOMER_SQL, (customer_id,)).fetchone()
+    
+    if row:
+        result = {"success": True, "customer": dict(zip(CUSTOMER_COLUMNS, row))}
+        _customer_cache.set(customer_id, result, version)
+        return result
+    return {"success": False, "error": f"Customer {customer_id} not found"}
+
+
+def _list_customers_impl(status: str = None, limit: int = 10) -> dict:
+    """List customers, optionally filtered by status."""
+    error = _invalid("status", status, CUSTOMER_STATUSES)
+    if error:
+        return error
+    
+    key = (status, limit)
+    cached = _customer_list_cache.get(key)
+    if cached is not None:
+        return cached
+    
+    version = _customer_list_cache.version
+    with reader_pool.acquire() as conn:
+        cursor = conn.cursor()
+        if status:
+            cursor.execute(_LIST_CUSTOMERS_BY_STATUS_SQL, (status, limit))
+        else:
+            cursor.execute(_LIST_CUSTOMERS_SQL, (limit,))
+        customers = [dict(zip(CUSTOMER_COLUMNS, row)) for row in cursor]
+    
+    result = {
+        "success": True, 
+        "customers": customers,
+        "count": len(customers)
+    }
+    _customer_list_cache.set(key, result, version)
+    return result
+
+
+def _update_customer_row(cursor, customer_id, email, phone, name, status):
+    """Write job: apply a customer update and return the new row, or None."""
+    row = cursor.execute(_UPDATE_CUSTOMER_SQL, (email, phone, name, status, customer_id)).fetchone()
+    cursor.close()
+    return row
+
+
+def _insert_ticket_row(cursor, customer_id, issue, priority):
+    """Write job: insert a ticket and return (customer_name, ticket), or None."""
+    row = cursor.execute(_INSERT_TICKET_SQL, (issue, priority, customer_id)).fetchone()
+    cursor.close()
+    if not row:
+        return None
+    return row[-1], dict(zip(TICKET_COLUMNS, row))
+
+
+def _update_customer_impl(customer_id: int, email: str = None, phone: str = None,
+                          name: str = None, status: str = None) -> dict:
+    """Update the given customer fields and return the updated row."""
+    updates = {}
+    if email: updates['email'] = email
+    if phone: updates['phone'] = phone
+    if name: updates['name'] = name
+    if status: updates['status'] = status
+    
+    if not updates:
+        return {"success": False, "error": "No fields to update"}
+    error = _invalid("status", status, CUSTOMER_STATUSES)
+    if error:
+        return error
+    
+    row = _submit_write(
+        _update_customer_row, customer_id,
+        updates.get('email'), updates.get('phone'), updates.get('name'), updates.get('status')
+    )
+    _customer_cache.pop(customer_id)
+    _customer_list_cache.clear()
+    
+    if not row:
+        return {"success": False, "error": f"Customer {customer_id} not found"}
+    
+    return {
+        "success": True, 
+        "customer": dict(zip(CUSTOMER_COLUMNS, row)),
+        "updated_fields": list(updates.keys())
+    }
+
+
+def _create_ticket_impl(customer_id: int, issue: str, priority: str = "medium") -> dict:
+    """Open a new ticket for an existing customer."""
+    error = _invalid("priority", priority, TICKET_PRIORITIES)
+    if error:
+        return error
+    created = _submit_write(_insert_ticket_row, customer_id, issue, priority)
+    if not created:
+        return {"success": False, "error": f"Customer {customer_id} not found"}
+    
+    customer_name, ticket = created
+    return {
+        "success": True,
+        "ticket": ticket,
+        "customer_name": customer_name
+    }
+
+
+def _get_customer_history_impl(customer_id: int) -> dict:
+    """Fetch a customer with their tickets and ticket statistics."""
+    with reader_pool.acquire() as conn:
+        rows = conn.execute(_CUSTOMER_HISTORY_SQL, (customer_id,)).fetchall()
+    if not rows:
+        return {"success": False, "error": "Customer not found"}
+    
+    # The first seven columns are the customer, in CUSTOMER_COLUMNS order
+    customer = dict(zip(CUSTOMER_COLUMNS, rows[0]))
+    tickets = [
+        {
+            "id": row[7],
+            "customer_id": row[0],
+            "issue": row[8],
+            "status": row[9],
+            "priority": row[10],
+            "created_at": row[11]
+        }
+        for row in rows if row[7] is not None
+    ]
+    
+    total, open_count, in_progress, resolved = rows[0][12:16]
+    stats = {
+        "total": total,
+        "open": open_count,
+        "in_progress": in_progress,
+        "resolved": resolved
+    }
+    
+    return {
+        "success": True,
+        "customer": customer,
+        "tickets": tickets,
+        "statistics": stats
+    }
+
+
+def _get_tickets_by_priority_impl(priority: str, status: str = None) -> dict:
+    """Fetch tickets of a priority, optionally filtered by status."""
+    error = _invalid("priority", priority, TICKET_PRIORITIES) or _invalid("status", status, TICKET_STATUSES)
+    if error:
+        return error
+    
+    with reader_pool.acquire() as conn:
+        cursor = conn.cursor()
+        
+        if status:
+            cursor.execute(_TICKETS_BY_PRIORITY_STATUS_SQL, (priority, status))
+        else:
+            cursor.execute(_TICKETS_BY_PRIORITY_SQL, (priority,))
+        
+        tickets = [dict(zip(_PRIORITY_TICKET_COLUMNS, row)) for row in cursor]
+    
+    return {"success": True, "tickets": tickets, "count": len(tickets)}
+
+
+def _get_active_customers_with_open_tickets_impl() -> dict:
+    """Report active customers together with their open tickets."""
+    result = []
+    with reader_pool.acquire() as conn:
+        # Group straight off the cursor so only one customer's rows are
+        # materialized at a time, never the whole result set
+        for _, group in groupby(conn.execute(_OPEN_TICKETS_REPORT_SQL), key=itemgetter(0)):
+            group = list(group)
+            cust_id, name, email, status = group[0][:4]
+            open_tickets = [{"id": row[4], "issue": row[5], "priority": row[6]} for row in group]
+            result.append({
+                "customer": {"id": cust_id, "name": name, "email": email, "status": status},
+                "open_tickets": open_tickets,
+                "ticket_count": len(open_tickets)
+            })
+    
+    return {
+        "success": True,
+        "customers": result,
+        "total_customers": len(result)
+    }
+
+
 # =============================================================================
 # MCP Tools - These will appear in tools/list
 # =============================================================================
+# sqlite3 calls block, so each tool runs its query in a worker thread; the SSE
+# event loop stays free to serve other sessions while a slow query runs.
+# Serialization happens in the same thread, so only the finished JSON string
+# crosses back to the loop.
+
+def _dumps(obj) -> str:
+    """Serialize a tool result to a JSON string.
+    
+    default=str keeps the old json.dumps(..., default=str) fallback for any
+    value orjson can't encode natively (e.g. a Decimal from a custom query).
+    """
+    return orjson.dumps(obj, default=str).decode()
+
+
+def _dump_result(impl, *args) -> str:
+    """Run a tool implementation and serialize its result."""
+    return _dumps(impl(*args))
+
+
+async def _run_tool(impl, *args) -> str:
+    """Run a tool implementation and its serialization in a worker thread."""
+    return await asyncio.to_thread(_dump_result, impl, *args)
+
+
+# Concurrent get_customer calls for the same ID share one in-flight lookup
+# (singleflight); the TTL cache serves them once it is filled. A write drops
+# the entry so later calls can't join a lookup that may predate it.
+_customer_inflight = {}
+
+
+def _forget_inflight(inflight: dict, key, task) -> None:
+    """Drop key's in-flight entry if it still refers to task."""
+    if inflight.get(key) is task:
+        del inflight[key]
+
+
+async def _run_tool_shared(inflight: dict, key, impl, *args) -> str:
+    """Run a tool like _run_tool, joining an identical call already in flight."""
+    task = inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_run_tool(impl, *args))
+        inflight[key] = task
+        # Only remove our own entry; a write may already have replaced it
+        task.add_done_callback(lambda t: _forget_inflight(inflight, key, t))
+    # shield: one caller being cancelled must not cancel the lookup the
+    # others are waiting on
+    return await asyncio.shield(task)
+
 
 @mcp.tool()
-def get_customer(customer_id: int) -> str:
+async def get_customer(customer_id: int) -> str:
     """
     Get customer information by ID.
     
@@ -129,19 +746,11 @@ def get_customer(customer_id: int) -> str:
     Returns:
         JSON string with customer data
     """
-    conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM customers WHERE id = ?", (customer_id,))
-    row = cursor.fetchone()
-    conn.close()
-    
-    if row:
-        return json.dumps({"success": True, "customer": dict(row)}, default=str)
-    return json.dumps({"success": False, "error": f"Customer {customer_id} not found"})
+    return await _run_tool_shared(_customer_inflight, customer_id, _get_customer_impl, customer_id)
 
 
 @mcp.tool()
-def list_customers(status: str = None, limit: int = 10) -> str:
+async def list_customers(status: str = None, limit: int = 10) -> str:
     """
     List customers with optional status filter.
     
@@ -152,26 +761,11 @@ def list_customers(status: str = None, limit: int = 10) -> str:
     Returns:
         JSON string with list of customers
     """
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    if status:
-        cursor.execute("SELECT * FROM customers WHERE status = ? LIMIT ?", (status, limit))
-    else:
-        cursor.execute("SELECT * FROM customers LIMIT ?", (limit,))
-    
-    rows = cursor.fetchall()
-    conn.close()
-    
-    return json.dumps({
-        "success": True, 
-        "customers": [dict(row) for row in rows],
-        "count": len(rows)
-    }, default=str)
+    return await _run_tool(_list_customers_impl, status, limit)
 
 
 @mcp.tool()
-def update_customer(customer_id: int, email: str = None, phone: str = None, 
+async def update_customer(customer_id: int, email: str = None, phone: str = None, 
                    name: str = None, status: str = None) -> str:
     """
     Update customer information.
@@ -186,41 +780,13 @@ def update_customer(customer_id: int, email: str = None, phone: str = None,
     Returns:
         JSON string with updated customer data
     """
-    updates = {}
-    if email: updates['email'] = email
-    if phone: updates['phone'] = phone
-    if name: updates['name'] = name
-    if status: updates['status'] = status
-    
-    if not updates:
-        return json.dumps({"success": False, "error": "No fields to update"})
-    
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT id FROM customers WHERE id = ?", (customer_id,))
-    if not cursor.fetchone():
-        conn.close()
-        return json.dumps({"success": False, "error": f"Customer {customer_id} not found"})
-    
-    set_clause = ", ".join([f"{k} = ?" for k in updates.keys()])
-    values = list(updates.values()) + [customer_id]
-    cursor.execute(f"UPDATE customers SET {set_clause} WHERE id = ?", values)
-    conn.commit()
-    
-    cursor.execute("SELECT * FROM customers WHERE id = ?", (customer_id,))
-    row = cursor.fetchone()
-    conn.close()
-    
-    return json.dumps({
-        "success": True, 
-        "customer": dict(row),
-        "updated_fields": list(updates.keys())
-    }, default=str)
+    result = await _run_tool(_update_customer_impl, customer_id, email, phone, name, status)
+    _customer_inflight.pop(customer_id, None)
+    return result
 
 
 @mcp.tool()
-def create_ticket(customer_id: int, issue: str, priority: str = "medium") -> str:
+async def create_ticket(customer_id: int, issue: str, priority: str = "medium") -> str:
     """
     Create a new support ticket.
     
@@ -232,35 +798,11 @@ def create_ticket(customer_id: int, issue: str, priority: str = "medium") -> str
     Returns:
         JSON string with created ticket data
     """
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT id, name FROM customers WHERE id = ?", (customer_id,))
-    customer = cursor.fetchone()
-    if not customer:
-        conn.close()
-        return json.dumps({"success": False, "error": f"Customer {customer_id} not found"})
-    
-    cursor.execute(
-        "INSERT INTO tickets (customer_id, issue, status, priority) VALUES (?, ?, 'open', ?)",
-        (customer_id, issue, priority)
-    )
-    ticket_id = cursor.lastrowid
-    conn.commit()
-    
-    cursor.execute("SELECT * FROM tickets WHERE id = ?", (ticket_id,))
-    ticket = cursor.fetchone()
-    conn.close()
-    
-    return json.dumps({
-        "success": True,
-        "ticket": dict(ticket),
-        "customer_name": customer["name"]
-    }, default=str)
+    return await _run_tool(_create_ticket_impl, customer_id, issue, priority)
 
 
 @mcp.tool()
-def get_customer_history(customer_id: int) -> str:
+async def get_customer_history(customer_id: int) -> str:
     """
     Get ticket history for a customer.
     
@@ -270,36 +812,11 @@ def get_customer_history(customer_id: int) -> str:
     Returns:
         JSON string with customer info and ticket history
     """
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT * FROM customers WHERE id = ?", (customer_id,))
-    customer = cursor.fetchone()
-    if not customer:
-        conn.close()
-        return json.dumps({"success": False, "error": "Customer not found"})
-    
-    cursor.execute("SELECT * FROM tickets WHERE customer_id = ? ORDER BY created_at DESC", (customer_id,))
-    tickets = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    
-    stats = {
-        "total": len(tickets),
-        "open": len([t for t in tickets if t["status"] == "open"]),
-        "in_progress": len([t for t in tickets if t["status"] == "in_progress"]),
-        "resolved": len([t for t in tickets if t["status"] == "resolved"])
-    }
-    
-    return json.dumps({
-        "success": True,
-        "customer": dict(customer),
-        "tickets": tickets,
-        "statistics": stats
-    }, default=str)
+    return await _run_tool(_get_customer_history_impl, customer_id)
 
 
 @mcp.tool()
-def get_tickets_by_priority(priority: str, status: str = None) -> str:
+async def get_tickets_by_priority(priority: str, status: str = None) -> str:
     """
     Get tickets filtered by priority.
     
@@ -310,69 +827,18 @@ def get_tickets_by_priority(priority: str, status: str = None) -> str:
     Returns:
         JSON string with filtered tickets
     """
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    if status:
-        cursor.execute("""
-            SELECT t.*, c.name as customer_name
-            FROM tickets t JOIN customers c ON t.customer_id = c.id
-            WHERE t.priority = ? AND t.status = ?
-        """, (priority, status))
-    else:
-        cursor.execute("""
-            SELECT t.*, c.name as customer_name
-            FROM tickets t JOIN customers c ON t.customer_id = c.id
-            WHERE t.priority = ?
-        """, (priority,))
-    
-    tickets = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    
-    return json.dumps({"success": True, "tickets": tickets, "count": len(tickets)}, default=str)
+    return await _run_tool(_get_tickets_by_priority_impl, priority, status)
 
 
 @mcp.tool()
-def get_active_customers_with_open_tickets() -> str:
+async def get_active_customers_with_open_tickets() -> str:
     """
     Get all active customers who have open tickets.
     
     Returns:
         JSON string with active customers and their open tickets
     """
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT DISTINCT c.id, c.name, c.email, c.status
-        FROM customers c
-        JOIN tickets t ON c.id = t.customer_id
-        WHERE c.status = 'active' AND t.status = 'open'
-    """)
-    
-    customers = cursor.fetchall()
-    result = []
-    
-    for customer in customers:
-        cursor.execute("""
-            SELECT id, issue, priority FROM tickets 
-            WHERE customer_id = ? AND status = 'open'
-        """, (customer["id"],))
-        
-        open_tickets = [dict(t) for t in cursor.fetchall()]
-        result.append({
-            "customer": dict(customer),
-            "open_tickets": open_tickets,
-            "ticket_count": len(open_tickets)
-        })
-    
-    conn.close()
-    
-    return json.dumps({
-        "success": True,
-        "customers": result,
-        "total_customers": len(result)
-    }, default=str)
+    return await _run_tool(_get_active_customers_with_open_tickets_impl)
 
 
 # =============================================================================
@@ -380,26 +846,45 @@ def get_active_customers_with_open_tickets() -> str:
 # =============================================================================
 
 if __name__ == "__main__":
-    setup_database()
-    
-    print("\n" + "="*60)
-    print("🚀 MCP CUSTOMER SUPPORT SERVER")
-    print("="*60)
-    print("\nStarting MCP Server with SSE transport...")
-    print("URL: http://localhost:8000/sse")
-    print("\nTo test with MCP Inspector:")
-    print("  npx @modelcontextprotocol/inspector")
-    print("  Connect to: http://localhost:8000/sse")
-    print("\nAvailable tools (tools/list):")
-    print("  • get_customer(customer_id)")
-    print("  • list_customers(status, limit)")
-    print("  • update_customer(customer_id, email, phone, name, status)")
-    print("  • create_ticket(customer_id, issue, priority)")
-    print("  • get_customer_history(customer_id)")
-    print("  • get_tickets_by_priority(priority, status)")
-    print("  • get_active_customers_with_open_tickets()")
-    print("="*60)
-    print("\nPress Ctrl+C to stop\n")
-    
-    # Run with SSE transport - this is what MCP Inspector connects to
-    mcp.run(transport="sse", host="0.0.0.0", port=8000)
+    parser = argparse.ArgumentParser(description="MCP customer support server")
+    parser.add_argument("--stdio", action="store_true",
+                        help="serve over stdin/stdout instead of SSE on port 8000")
+    args = parser.parse_args()
+    
+    # In stdio mode stdout carries the JSON-RPC stream, so anything
+    # human-readable has to go to stderr
+    with redirect_stdout(sys.stderr if args.stdio else sys.stdout):
+        setup_database()
+        open_pool()
+        
+        print("\n" + "="*60)
+        print("🚀 MCP CUSTOMER SUPPORT SERVER")
+        print("="*60)
+        if args.stdio:
+            print("\nStarting MCP Server with stdio transport...")
+        else:
+            print("\nStarting MCP Server with SSE transport...")
+            print("URL: http://localhost:8000/sse")
+            print("\nTo test with MCP Inspector:")
+            print("  npx @modelcontextprotocol/inspector")
+            print("  Connect to: http://localhost:8000/sse")
+        print("\nAvailable tools (tools/list):")
+        print("  • get_customer(customer_id)")
+        print("  • list_customers(status, limit)")
+        print("  • update_customer(customer_id, email, phone, name, status)")
+        print("  • create_ticket(customer_id, issue, priority)")
+        print("  • get_customer_history(customer_id)")
+        print("  • get_tickets_by_priority(priority, status)")
+        print("  • get_active_customers_with_open_tickets()")
+        print("="*60)
+        print("\nPress Ctrl+C to stop\n")
+    
+    # uvloop's C transports cut per-event overhead for the many small
+    # messages an MCP server handles; fall back to asyncio where unavailable
+    if uvloop is not None:
+        uvloop.install()
+    if args.stdio:
+        mcp.run(transport="stdio")
+    else:
+        # Run with SSE transport - this is what MCP Inspector connects to
+        mcp.run(transport="sse", host="0.0.0.0", port=8000)
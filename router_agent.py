@@ -17,13 +17,22 @@ Prerequisites:
 """
 
 import re
-import json
+import sys
+import time
+import queue
 import asyncio
-import httpx
+import logging
+import logging.handlers
+from collections import OrderedDict
+import aiohttp
+import orjson
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from typing import List, Dict, Any
+from uuid import uuid4
 
 from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryTaskStore
+from a2a.server.tasks import TaskStore
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.types import (
     AgentCard, AgentSkill, AgentCapabilities,
@@ -31,9 +40,19 @@ from a2a.types import (
 )
 from starlette.applications import Starlette
 from starlette.routing import Route
-from starlette.responses import JSONResponse
+from starlette.responses import Response
 import uvicorn
 
+try:
+    import uvloop
+except ImportError:  # optional speedup; uvloop is not available on Windows
+    uvloop = None
+
+# Per-request progress goes through logging rather than print(): the server
+# installs a QueueHandler (see setup_logging), so the event loop only enqueues
+# records and a background thread does the blocking stdout writes.
+logger = logging.getLogger("router_agent")
+
 
 # =============================================================================
 # Agent Card Definition
@@ -77,119 +96,246 @@ AGENT_CARD = AgentCard(
 # A2A Client for Remote Agents
 # =============================================================================
 
+# One keep-alive connection pool shared by every outbound A2A call, so routing
+# a query reuses warm connections instead of opening a new one per hop. The
+# router only forwards small JSON-RPC requests to two local agents, where
+# aiohttp's connector sustains more concurrent requests than httpx's pool.
+# The session is created on first use (or at app startup) and closed on app
+# shutdown; aiohttp sessions must be created inside the running event loop.
+_http_session = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Return the shared outbound HTTP session, creating it on first use."""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=30.0),
+            connector=aiohttp.TCPConnector(limit=100, limit_per_host=50, keepalive_timeout=30)
+        )
+    return _http_session
+
+
+async def close_http_session():
+    """Close the shared outbound HTTP session."""
+    global _http_session
+    if _http_session is not None:
+        await _http_session.close()
+        _http_session = None
+
+
+# A2A JSON-RPC tasks/send request, pre-encoded around its only variable parts
+# (the task id, used for both params.id and the request id, and the message
+# text), so sending a task doesn't rebuild and re-serialize the nested dict:
+# {"jsonrpc": "2.0", "method": "tasks/send",
+#  "params": {"id": ID, "message": {"role": "user", "parts": [{"text": TEXT}]}},
+#  "id": ID}
+_TASK_SEND_PREFIX = b'{"jsonrpc":"2.0","method":"tasks/send","params":{"id":"'
+_TASK_SEND_MESSAGE = b'","message":{"role":"user","parts":[{"text":'
+_TASK_SEND_REQUEST_ID = b'}]}},"id":"'
+_TASK_SEND_SUFFIX = b'"}'
+
+
+# Remote agent cards rarely change, so a fetched card is reused for this long
+AGENT_CARD_TTL = 60.0
+
+
 class A2AClient:
     """Client for communicating with remote A2A agents."""
     
-    def __init__(self, agent_url: str):
+    def __init__(self, agent_url: str, session: aiohttp.ClientSession = None):
         self.agent_url = agent_url.rstrip('/')
+        self._session = session
+        self._card = None
+        self._card_expires = 0.0
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the injected session, or the shared module-level one."""
+        return self._session if self._session is not None else get_http_session()
     
     async def get_agent_card(self) -> dict:
-        """Fetch the agent card."""
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            try:
-                response = await client.get(f"{self.agent_url}/.well-known/agent.json")
-                if response.status_code == 200:
-                    return response.json()
-                return {"error": f"Status {response.status_code}"}
-            except Exception as e:
-                return {"error": str(e)}
+        """Fetch the agent card, reusing a successfully fetched one for AGENT_CARD_TTL."""
+        if self._card is not None and time.monotonic() < self._card_expires:
+            return self._card
+        try:
+            async with self._get_session().get(
+                f"{self.agent_url}/.well-known/agent.json",
+                timeout=aiohttp.ClientTimeout(total=10.0)
+            ) as response:
+                if response.status == 200:
+                    self._card = orjson.loads(await response.read())
+                    self._card_expires = time.monotonic() + AGENT_CARD_TTL
+                    return self._card
+                return {"error": f"Status {response.status}"}
+        except Exception as e:
+            return {"error": str(e)}
     
-    async def send_task(self, message: str) -> dict:
-        """Send a task to the remote agent via A2A protocol."""
-        import uuid
-        task_id = str(uuid.uuid4())
+    async def send_task_raw(self, message: str) -> bytes:
+        """Send a task to the remote agent and return the raw JSON-RPC response body.
         
-        # A2A JSON-RPC request format
-        request = {
-            "jsonrpc": "2.0",
-            "method": "tasks/send",
-            "params": {
-                "id": task_id,
-                "message": {
-                    "role": "user",
-                    "parts": [{"text": message}]
-                }
-            },
-            "id": task_id
-        }
+        Transport errors propagate; send_task() is the variant that reports
+        them as an {"error": ...} response.
+        """
+        # A UUID is plain ASCII, so it can be spliced in without escaping
+        task_id = str(uuid4()).encode()
+        body = b"".join((
+            _TASK_SEND_PREFIX, task_id, _TASK_SEND_MESSAGE, orjson.dumps(message),
+            _TASK_SEND_REQUEST_ID, task_id, _TASK_SEND_SUFFIX
+        ))
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.post(
-                    self.agent_url,
-                    json=request,
-                    headers={"Content-Type": "application/json"}
-                )
-                return response.json()
-            except Exception as e:
-                return {"error": str(e)}
+        async with self._get_session().post(
+            self.agent_url,
+            data=body,
+            headers={"Content-Type": "application/json"}
+        ) as response:
+            return await response.read()
+    
+    async def send_task(self, message: str) -> dict:
+        """Send a task to the remote agent via A2A protocol."""
+        try:
+            return orjson.loads(await self.send_task_raw(message))
+        except Exception as e:
+            return {"error": str(e)}
 
 
 # Remote agent clients
 data_agent_client = A2AClient("http://localhost:8001")
 support_agent_client = A2AClient("http://localhost:8002")
 
+# Upper bound on a single downstream agent call, so one slow agent can't hold
+# the whole routed response past this
+AGENT_CALL_TIMEOUT = 30.0
+
+# For urgent queries, once the Support Agent has escalated, the other agents
+# get this much longer before the router replies without them
+URGENT_GRACE_TIMEOUT = 2.0
+
+# Downstream calls left running after an urgent reply; referenced here so they
+# aren't garbage collected before they finish
+_background_calls = set()
+
 
 # =============================================================================
 # Intent Analysis
 # =============================================================================
 
-def analyze_intent(query: str) -> dict:
-    """Analyze query to determine intent(s) and extract parameters."""
+# Intent keywords, in the order detected intents are reported
+_INTENT_KEYWORDS = (
+    ("get_customer", ("get customer", "customer id", "customer info", "who is")),
+    ("view_history", ("ticket history", "my tickets", "show tickets")),
+    ("update_customer", ("update", "change email", "change phone")),
+    ("report", ("all active", "report", "open tickets")),
+    ("list_customers", ("list customers", "show customers")),
+    ("billing", ("billing", "charge", "invoice", "payment", "refund")),
+    ("cancellation", ("cancel", "cancellation")),
+    ("upgrade", ("upgrade", "premium")),
+    ("urgent", ("urgent", "immediately", "asap", "emergency")),
+)
+_INTENT_ORDER = tuple(intent for intent, _ in _INTENT_KEYWORDS)
+
+# Parameter patterns
+_ID_PATTERN = r'(?:customer\s*(?:id)?|id)\s*\d+'
+_EMAIL_PATTERN = r'[\w\.-]+@[\w\.-]+\.\w+'
+_EMAIL_RE = re.compile(_EMAIL_PATTERN)
+
+# Intent keywords, customer ID and email in a single pass over the query. The
+# leading lookahead lets the engine skip positions where nothing can match;
+# at the rest, three optional lookaheads capture the customer ID digits, an
+# email address and (one named group per intent) a keyword independently, so
+# one construct starting at the same position can't hide another. Keywords
+# overlapping each other are still reported, since every lookahead is
+# zero-width. The query is lowercased once, so the patterns are case-sensitive
+# rather than paying for IGNORECASE folding on every character.
+_QUERY_RE = re.compile(
+    "(?=" + "|".join(
+        [_ID_PATTERN, _EMAIL_PATTERN]
+        + [re.escape(keyword) for _, keywords in _INTENT_KEYWORDS for keyword in keywords]
+    ) + ")"
+    + r"(?:(?=(?:customer\s*(?:id)?|id)\s*(?P<customer_id>\d+)))?"
+    + f"(?:(?=(?P<email>{_EMAIL_PATTERN})))?"
+    + "(?:(?=" + "|".join(
+        f"(?P<{intent}>{'|'.join(map(re.escape, keywords))})"
+        for intent, keywords in _INTENT_KEYWORDS
+    ) + "))?"
+)
+
+# Intents handled by each downstream agent
+_DATA_INTENTS = frozenset({"get_customer", "view_history", "update_customer", "report", "list_customers"})
+_SUPPORT_INTENTS = frozenset({"billing", "cancellation", "upgrade", "urgent", "general"})
+
+# Each intent is one bit, so a query's intents are a single int and routing
+# and priority are mask tests; names are only produced for the result
+_INTENT_BITS = tuple((intent, 1 << i) for i, intent in enumerate(_INTENT_ORDER + ("general",)))
+_INTENT_BIT = dict(_INTENT_BITS)
+_DATA_MASK = sum(_INTENT_BIT[i] for i in _DATA_INTENTS)
+_SUPPORT_MASK = sum(_INTENT_BIT[i] for i in _SUPPORT_INTENTS)
+_HIGH_PRIORITY_MASK = _INTENT_BIT["urgent"] | _INTENT_BIT["billing"]
+
+
+def _intent_names(bits: int) -> tuple:
+    """Return the names of the intents set in bits, in reporting order."""
+    return tuple(intent for intent, bit in _INTENT_BITS if bits & bit)
+
+
+# Analysis is a pure function of the query text, so repeated phrasings (retries,
+# canned test queries) skip the scan. Bounded so arbitrary client input can't
+# grow it without limit.
+@lru_cache(maxsize=1024)
+def _analyze_intent_cached(query: str) -> tuple:
+    """Return (intents, params, data_intents, support_intents, priority), immutably."""
     query_lower = query.lower()
-    intents = []
-    params = {}
-    
-    # Data-related intents
-    if any(w in query_lower for w in ["get customer", "customer id", "customer info", "who is"]):
-        intents.append("get_customer")
-    if any(w in query_lower for w in ["ticket history", "my tickets", "show tickets"]):
-        intents.append("view_history")
-    if any(w in query_lower for w in ["update", "change email", "change phone"]):
-        intents.append("update_customer")
-    if any(w in query_lower for w in ["all active", "report", "open tickets"]):
-        intents.append("report")
-    if any(w in query_lower for w in ["list customers", "show customers"]):
-        intents.append("list_customers")
-    
-    # Support-related intents
-    if any(w in query_lower for w in ["billing", "charge", "invoice", "payment", "refund"]):
-        intents.append("billing")
-    if any(w in query_lower for w in ["cancel", "cancellation"]):
-        intents.append("cancellation")
-    if any(w in query_lower for w in ["upgrade", "premium"]):
-        intents.append("upgrade")
-    if any(w in query_lower for w in ["urgent", "immediately", "asap", "emergency"]):
-        intents.append("urgent")
-    
-    # Extract parameters
-    id_match = re.search(r'(?:customer\s*(?:id)?|id)\s*(\d+)', query_lower)
-    if id_match:
-        params["customer_id"] = int(id_match.group(1))
-    
-    email_match = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', query)
-    if email_match:
-        params["email"] = email_match.group()
-    
-    if not intents:
-        intents.append("general")
+    params = []
     
-    # Determine routing
-    data_intents = ["get_customer", "view_history", "update_customer", "report", "list_customers"]
-    support_intents = ["billing", "cancellation", "upgrade", "urgent", "general"]
+    bits = 0
+    customer_id = email_span = None
+    for m in _QUERY_RE.finditer(query_lower):
+        # The intent group closes last, so lastgroup names it when one matched
+        intent_bit = _INTENT_BIT.get(m.lastgroup)
+        if intent_bit:
+            bits |= intent_bit
+        if customer_id is None and m.group("customer_id"):
+            customer_id = int(m.group("customer_id"))
+        if email_span is None and m.group("email"):
+            email_span = m.span("email")
+    bits = bits or _INTENT_BIT["general"]
     
-    routing = {
-        "data_agent": [i for i in intents if i in data_intents],
-        "support_agent": [i for i in intents if i in support_intents]
-    }
+    # Extract parameters (the email keeps its original case)
+    if customer_id is not None:
+        params.append(("customer_id", customer_id))
+    
+    if email_span is not None:
+        if len(query_lower) == len(query):
+            params.append(("email", query[email_span[0]:email_span[1]]))
+        else:
+            # lower() changed the length (a few non-ASCII characters do), so
+            # the span doesn't map back onto the original query
+            params.append(("email", _EMAIL_RE.search(query).group()))
     
+    # Determine routing
+    return (
+        _intent_names(bits),
+        tuple(params),
+        _intent_names(bits & _DATA_MASK),
+        _intent_names(bits & _SUPPORT_MASK),
+        "HIGH" if bits & _HIGH_PRIORITY_MASK else "NORMAL"
+    )
+
+
+def analyze_intent(query: str) -> dict:
+    """Analyze query to determine intent(s) and extract parameters."""
+    intents, params, data_intents, support_intents, priority = _analyze_intent_cached(query)
+    
+    # Fresh containers on every call, so callers can't mutate the cached entry
     return {
         "query": query,
-        "intents": intents,
-        "params": params,
-        "routing": routing,
-        "is_multi_agent": bool(routing["data_agent"]) and bool(routing["support_agent"]),
-        "priority": "HIGH" if "urgent" in intents or "billing" in intents else "NORMAL"
+        "intents": list(intents),
+        "params": dict(params),
+        "routing": {
+            "data_agent": list(data_intents),
+            "support_agent": list(support_intents)
+        },
+        "is_multi_agent": bool(data_intents) and bool(support_intents),
+        "priority": priority
     }
 
 
@@ -212,32 +358,62 @@ class RouterAgentExecutor(AgentExecutor):
         else:
             text = str(query)
         
-        print(f"\n📥 Router Agent received: {text}")
+        logger.info("\n📥 Router Agent received: %s", text)
         
         # Analyze intent
         analysis = analyze_intent(text)
-        print(f"🎯 Intent Analysis: {analysis['intents']}")
-        print(f"   Routing: {analysis['routing']}")
+        logger.info("🎯 Intent Analysis: %s", analysis["intents"])
+        logger.info("   Routing: %s", analysis["routing"])
         
         # Route to appropriate agent(s) via A2A
-        responses = []
+        calls = []
         
         # Route to Customer Data Agent
         if analysis["routing"]["data_agent"]:
-            print(f"📤 Routing to Customer Data Agent...")
-            response = await data_agent_client.send_task(text)
-            responses.append(("Customer Data Agent", response))
+            logger.info("📤 Routing to Customer Data Agent...")
+            calls.append(("Customer Data Agent", data_agent_client.send_task_raw(text)))
         
         # Route to Support Agent
         if analysis["routing"]["support_agent"]:
-            print(f"📤 Routing to Support Agent...")
-            response = await support_agent_client.send_task(text)
-            responses.append(("Support Agent", response))
+            logger.info("📤 Routing to Support Agent...")
+            calls.append(("Support Agent", support_agent_client.send_task_raw(text)))
+        
+        # The agents are independent, so query them concurrently and format
+        # each agent's section as soon as it arrives
+        sections = {}
+        pending = {asyncio.ensure_future(self._call_agent(name, call)) for name, call in calls}
+        urgent = "urgent" in analysis["intents"]
+        deadline = None
+        loop = asyncio.get_running_loop()
+        while pending:
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            done, pending = await asyncio.wait(pending, timeout=timeout,
+                                               return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for finished in done:
+                agent_name, response, raw = finished.result()
+                sections[agent_name] = self._format_agent_response(agent_name, response, raw)
+            # An urgent escalation is the answer that matters; don't hold it
+            # for long behind a slower data lookup
+            if urgent and deadline is None and "Support Agent" in sections:
+                deadline = loop.time() + URGENT_GRACE_TIMEOUT
         
-        # Synthesize response
-        final_response = self._synthesize_response(text, analysis, responses)
+        # Anything still running after the grace period finishes in the
+        # background; its result is not part of this reply
+        for late in pending:
+            _background_calls.add(late)
+            late.add_done_callback(_background_calls.discard)
         
-        print(f"📤 Router Agent final response: {final_response[:200]}...")
+        # Synthesize response, with sections in routing order whichever finished first
+        final_response = self._synthesize_response(
+            text, analysis,
+            [sections.get(agent_name) or self._format_pending_agent(agent_name)
+             for agent_name, _ in calls]
+        )
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("📤 Router Agent final response: %s...", final_response[:200])
         
         # Create response
         artifact = Artifact(parts=[TextPart(text=final_response)])
@@ -249,51 +425,122 @@ class RouterAgentExecutor(AgentExecutor):
     async def cancel(self, context: RequestContext, event_queue: asyncio.Queue) -> None:
         raise NotImplementedError("Cancel not implemented")
     
-    def _synthesize_response(self, query: str, analysis: dict, responses: list) -> str:
-        """Synthesize final response from agent responses."""
+    @staticmethod
+    async def _call_agent(agent_name: str, call) -> tuple:
+        """Await one send_task_raw call and return (agent_name, response, raw body).
         
-        result = f"🔀 Router Agent Analysis\n"
-        result += f"{'='*50}\n"
-        result += f"Query: \"{query}\"\n"
-        result += f"Detected Intents: {analysis['intents']}\n"
-        result += f"Priority: {analysis['priority']}\n"
-        result += f"Parameters: {analysis['params']}\n\n"
+        A timeout or failure becomes an error response with no raw body.
+        """
+        try:
+            raw = await asyncio.wait_for(call, AGENT_CALL_TIMEOUT)
+            return agent_name, orjson.loads(raw), raw
+        except asyncio.TimeoutError:
+            return agent_name, {"error": f"No response within {AGENT_CALL_TIMEOUT:.0f}s"}, None
+        except Exception as e:
+            return agent_name, {"error": str(e)}, None
+    
+    def _synthesize_response(self, query: str, analysis: dict, sections: list) -> str:
+        """Synthesize final response from the formatted agent sections."""
+        
+        parts = [
+            "🔀 Router Agent Analysis\n",
+            f"{'='*50}\n",
+            f"Query: \"{query}\"\n",
+            f"Detected Intents: {analysis['intents']}\n",
+            f"Priority: {analysis['priority']}\n",
+            f"Parameters: {analysis['params']}\n\n",
+        ]
         
         if analysis["is_multi_agent"]:
-            result += "📋 Multi-Agent Coordination\n"
-            result += f"{'─'*50}\n"
+            parts.append("📋 Multi-Agent Coordination\n")
+            parts.append(f"{'─'*50}\n")
+        
+        parts.extend(sections)
         
-        for agent_name, response in responses:
-            result += f"\n🤖 Response from {agent_name}:\n"
-            result += f"{'─'*50}\n"
-            
-            # Extract text from A2A response
-            if "error" in response:
-                result += f"❌ Error: {response['error']}\n"
-            elif "result" in response:
-                res = response["result"]
-                if "artifacts" in res and res["artifacts"]:
-                    for artifact in res["artifacts"]:
-                        if "parts" in artifact:
-                            for part in artifact["parts"]:
-                                if "text" in part:
-                                    result += part["text"] + "\n"
-                elif "status" in res:
-                    result += f"Status: {res['status']}\n"
-            else:
-                result += json.dumps(response, indent=2, default=str)[:500] + "\n"
+        return "".join(parts)
+    
+    def _format_pending_agent(self, agent_name: str) -> str:
+        """Format the section for an agent that hadn't answered when an urgent reply was sent."""
+        return (
+            f"\n🤖 Response from {agent_name}:\n"
+            f"{'─'*50}\n"
+            "⏳ Still processing - urgent escalation sent without waiting for this answer\n"
+        )
+    
+    def _format_agent_response(self, agent_name: str, response: dict, raw: bytes = None) -> str:
+        """Format one agent's section of the synthesized response.
+        
+        raw is the response body response was parsed from (None only for
+        error responses); an unrecognized response is shown from it instead
+        of being re-serialized.
+        """
+        parts = [f"\n🤖 Response from {agent_name}:\n", f"{'─'*50}\n"]
+        
+        # Extract text from A2A response
+        if "error" in response:
+            parts.append(f"❌ Error: {response['error']}\n")
+        elif "result" in response:
+            res = response["result"]
+            if "artifacts" in res and res["artifacts"]:
+                for artifact in res["artifacts"]:
+                    if "parts" in artifact:
+                        for part in artifact["parts"]:
+                            if "text" in part:
+                                parts.append(part["text"] + "\n")
+            elif "status" in res:
+                parts.append(f"Status: {res['status']}\n")
+        else:
+            parts.append(raw[:500].decode(errors="replace") + "\n")
         
-        return result
+        return "".join(parts)
 
 
 # =============================================================================
 # A2A Server Setup
 # =============================================================================
 
+class ORJSONResponse(Response):
+    """JSON response encoded with orjson instead of the stdlib json module."""
+    
+    media_type = "application/json"
+    
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+
+class BoundedTaskStore(TaskStore):
+    """In-memory task store holding at most maxsize tasks.
+    
+    InMemoryTaskStore keeps every task for the life of the process; this one
+    evicts the least recently used task once full, so a long-running router's
+    memory stays flat. The methods never await, so each call is atomic on the
+    event loop without a lock.
+    """
+    
+    def __init__(self, maxsize: int = 10_000):
+        self.maxsize = maxsize
+        self._tasks = OrderedDict()
+    
+    async def save(self, task: Task, context=None) -> None:
+        self._tasks[task.id] = task
+        self._tasks.move_to_end(task.id)
+        if len(self._tasks) > self.maxsize:
+            self._tasks.popitem(last=False)
+    
+    async def get(self, task_id: str, context=None) -> Task | None:
+        task = self._tasks.get(task_id)
+        if task is not None:
+            self._tasks.move_to_end(task_id)
+        return task
+    
+    async def delete(self, task_id: str, context=None) -> None:
+        self._tasks.pop(task_id, None)
+
+
 def create_a2a_app():
     """Create the A2A Starlette application."""
     
-    task_store = InMemoryTaskStore()
+    task_store = BoundedTaskStore(maxsize=10_000)
     agent_executor = RouterAgentExecutor()
     
     request_handler = DefaultRequestHandler(
@@ -302,31 +549,51 @@ def create_a2a_app():
         agent_executor=agent_executor
     )
     
+    # The card never changes at runtime, so serialize it once per app
+    agent_card_bytes = AGENT_CARD.__pydantic_serializer__.to_json(AGENT_CARD, exclude_none=True)
+    
     async def agent_card_handler(request):
-        return JSONResponse(AGENT_CARD.model_dump(exclude_none=True))
+        return Response(agent_card_bytes, media_type="application/json")
     
     async def a2a_handler(request):
-        body = await request.json()
+        body = orjson.loads(await request.body())
         response = await request_handler.handle_request(body)
-        return JSONResponse(response)
+        return ORJSONResponse(response)
     
     async def health_handler(request):
         """Check health of subordinate agents."""
-        data_card = await data_agent_client.get_agent_card()
-        support_card = await support_agent_client.get_agent_card()
+        data_card, support_card = await asyncio.gather(
+            data_agent_client.get_agent_card(), support_agent_client.get_agent_card()
+        )
         
-        return JSONResponse({
+        return ORJSONResponse({
             "router": "online",
             "data_agent": "online" if "error" not in data_card else data_card["error"],
             "support_agent": "online" if "error" not in support_card else support_card["error"]
         })
     
+    @asynccontextmanager
+    async def lifespan(app):
+        # Open the shared session with the app and close it on shutdown
+        app.state.http_session = get_http_session()
+        # Warm the agent card caches in the background; startup doesn't wait
+        # for (or fail on) agents that aren't up yet
+        app.state.card_prefetch = asyncio.gather(
+            data_agent_client.get_agent_card(), support_agent_client.get_agent_card()
+        )
+        try:
+            yield
+        finally:
+            app.state.card_prefetch.cancel()
+            await close_http_session()
+    
     app = Starlette(
         routes=[
             Route("/.well-known/agent.json", agent_card_handler, methods=["GET"]),
             Route("/", a2a_handler, methods=["POST"]),
             Route("/health", health_handler, methods=["GET"]),
-        ]
+        ],
+        lifespan=lifespan
     )
     
     return app
@@ -336,6 +603,22 @@ def create_a2a_app():
 # Main
 # =============================================================================
 
+def setup_logging() -> logging.handlers.QueueListener:
+    """Route router logs through a queue drained by a background thread.
+    
+    Returns the started listener; stop it on shutdown to flush pending records.
+    """
+    log_queue = queue.Queue(-1)
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    listener.start()
+    return listener
+
+
 if __name__ == "__main__":
     print("\n" + "="*60)
     print("🤖 ROUTER AGENT - ORCHESTRATOR (A2A Server)")
@@ -352,5 +635,12 @@ if __name__ == "__main__":
     print("="*60)
     print("\nPress Ctrl+C to stop\n")
     
+    log_listener = setup_logging()
     app = create_a2a_app()
-    uvicorn.run(app, host="0.0.0.0", port=8003)
+    try:
+        # uvloop for the fan-out I/O; http="auto" picks the httptools parser
+        # when installed (uvicorn[standard]) and falls back to h11 otherwise
+        uvicorn.run(app, host="0.0.0.0", port=8003,
+                    loop="uvloop" if uvloop is not None else "asyncio", http="auto")
+    finally:
+        log_listener.stop()
@@ -0,0 +1,146 @@
+"""
+Tests for the Customer Data Agent's tool declarations and MCP client.
+
+Gemini rejects OBJECT schemas that declare no properties, and one bad
+declaration fails every model call the agent makes, so each tool's
+declaration is built here the way ADK builds it for the model. The MCP
+client tests swap in fake connections and calls, so no server is needed.
+
+To run:
+    python -m pytest test_customer_data_agent.py
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("google.adk")
+pytest.importorskip("mcp")
+
+from google.adk.tools import BaseTool, FunctionTool
+from google.genai import types
+
+import customer_data_agent
+from customer_data_agent import CustomerOp, batch_customer_ops
+
+try:
+    ExceptionGroup
+except NameError:  # Python 3.10; anyio depends on the backport there
+    from exceptiongroup import ExceptionGroup
+
+
+def _schemas(schema):
+    """Yield schema and every schema nested in it."""
+    if schema is None:
+        return
+    yield schema
+    for child in (schema.properties or {}).values():
+        yield from _schemas(child)
+    yield from _schemas(schema.items)
+
+
+def _declarations():
+    for tool in customer_data_agent.customer_data_agent.tools:
+        if not isinstance(tool, BaseTool):
+            tool = FunctionTool(tool)
+        yield tool._get_declaration()
+
+
+def test_declarations_have_no_empty_objects():
+    for declaration in _declarations():
+        for schema in _schemas(declaration.parameters):
+            if schema.type == types.Type.OBJECT and schema is not declaration.parameters:
+                assert schema.properties, f"{declaration.name}: OBJECT schema without properties"
+
+
+def test_batch_ops_items_are_typed():
+    declaration = next(d for d in _declarations() if d.name == "batch_customer_ops")
+    items = declaration.parameters.properties["ops"].items
+    assert items.type == types.Type.OBJECT
+    assert {"tool", "customer_id", "email"} <= set(items.properties)
+
+
+def test_batch_ops_builds_each_tools_arguments(monkeypatch):
+    captured = []
+
+    async def fake_batch(calls):
+        captured.extend(calls)
+        return [{"success": True}] * len(calls)
+
+    monkeypatch.setattr(customer_data_agent.mcp_client, "call_tools_batch", fake_batch)
+    result = asyncio.run(batch_customer_ops([
+        CustomerOp(tool="update_customer", customer_id=2, email="new@email.com"),
+        {"tool": "get_customer_history", "customer_id": 2},
+    ]))
+
+    assert result["success"]
+    assert captured == [
+        ("update_customer", {"customer_id": 2, "email": "new@email.com"}),
+        ("get_customer_history", {"customer_id": 2}),
+    ]
+
+
+def test_batch_ops_rejects_unknown_tool():
+    result = asyncio.run(batch_customer_ops([CustomerOp(tool="drop_table")]))
+    assert result == {"success": False, "error": "Unknown tool: drop_table"}
+
+
+def test_reconnect_retries_exception_groups(monkeypatch):
+    monkeypatch.setattr(customer_data_agent, "MCP_RECONNECT_BASE_DELAY", 0)
+    client = customer_data_agent.MCPClientWrapper("http://localhost:1/sse")
+    stale = object()
+    client._session = stale
+    attempts = []
+
+    async def fake_connect():
+        attempts.append(len(attempts))
+        if len(attempts) < customer_data_agent.MCP_RECONNECT_ATTEMPTS:
+            raise ExceptionGroup("connect failed", [OSError("refused")])
+        client._session = "fresh"
+
+    monkeypatch.setattr(client, "connect", fake_connect)
+    asyncio.run(client._reconnect(stale))
+
+    assert len(attempts) == customer_data_agent.MCP_RECONNECT_ATTEMPTS
+    assert client._session == "fresh"
+
+
+def test_reconnect_gives_up_after_last_attempt(monkeypatch):
+    monkeypatch.setattr(customer_data_agent, "MCP_RECONNECT_BASE_DELAY", 0)
+    client = customer_data_agent.MCPClientWrapper("http://localhost:1/sse")
+    stale = object()
+    client._session = stale
+    attempts = []
+
+    async def fake_connect():
+        attempts.append(len(attempts))
+        raise ExceptionGroup("connect failed", [OSError("refused")])
+
+    monkeypatch.setattr(client, "connect", fake_connect)
+    with pytest.raises(ExceptionGroup):
+        asyncio.run(client._reconnect(stale))
+    assert len(attempts) == customer_data_agent.MCP_RECONNECT_ATTEMPTS
+
+
+def test_batch_keeps_results_when_one_call_fails(monkeypatch):
+    client = customer_data_agent.MCPClientWrapper("http://localhost:1/sse")
+
+    async def fake_ensure_session():
+        return None
+
+    async def fake_call_tool(tool_name, arguments):
+        if tool_name == "get_customer_history":
+            raise RuntimeError("connection reset")
+        return {"success": True, "tool": tool_name}
+
+    monkeypatch.setattr(client, "_ensure_session", fake_ensure_session)
+    monkeypatch.setattr(client, "call_tool", fake_call_tool)
+    results = asyncio.run(client.call_tools_batch([
+        ("update_customer", {"customer_id": 2, "email": "new@email.com"}),
+        ("get_customer_history", {"customer_id": 2}),
+    ]))
+
+    assert results == [
+        {"success": True, "tool": "update_customer"},
+        {"success": False, "error": "connection reset"},
+    ]